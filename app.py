@@ -1,7 +1,18 @@
 ﻿import streamlit as st
 import pandas as pd
+import numpy as np
 import altair as alt
 
+from data import (
+    data_version, load_data, game_dates, team_list,
+    build_date_index, build_team_index,
+    enrich_full, result_labels, matchup_keys
+)
+
+# Copy-on-Write is always on from pandas 3; opt in on 2.x so derived frames share blocks instead of copying
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.options.mode.copy_on_write = True
+
 # Full-width layout
 st.set_page_config(layout="wide")
 
@@ -27,45 +38,35 @@ def styled_table(df):
         {'selector': 'td', 'props': [('text-align', 'center')]}
     ])
 
-# === LOAD DATA ===
-@st.cache_data
-def load_data():
-    df = pd.read_csv("comparison.csv")
-    df["GameDate"] = pd.to_datetime(df["GameDate"])
-    df["GameId"] = df["GameId"].astype(str)
-    df = df.drop_duplicates(subset=["GameId"])
-    return df
+# === DATAFRAME ALIGNMENT HELPER ===
+# The page CSS only reaches st.table, so st.dataframe grids center each column (and the index) explicitly
+def centered_columns(df, config=None):
+    centered = {col: st.column_config.Column(alignment="center") for col in ["_index", *df.columns]}
+    return {**centered, **(config or {})}
 
-df = load_data()
+# === LOAD DATA ===
+version = data_version()
+df = load_data(version)
+weekly_raw, spread_counts, total_counts = enrich_full(version)
+date_index = build_date_index(version)
+team_index = build_team_index(version)
 
 # === FILTERS AT TOP ===
 st.markdown("### 📅 Filter Games")
 col1, col2 = st.columns(2)
 with col1:
-    selected_date = st.selectbox("Select Game Date", sorted(df["GameDate"].dt.date.unique()))
+    selected_date = st.selectbox("Select Game Date", game_dates(version))
 with col2:
-    teams = sorted(set(df["HomeTeam"].unique()).union(df["AwayTeam"].unique()))
-    selected_team = st.selectbox("Filter by Team (optional)", ["All"] + teams)
+    selected_team = st.selectbox("Filter by Team (optional)", ["All"] + team_list(version))
 
 # === FILTERED DATA ===
-filtered = df[df["GameDate"].dt.date == selected_date]
+rows = date_index.get(selected_date, np.array([], dtype=np.intp))
 if selected_team != "All":
-    filtered = filtered[(filtered["HomeTeam"] == selected_team) | (filtered["AwayTeam"] == selected_team)]
+    rows = np.intersect1d(rows, team_index[selected_team])
+filtered = df.iloc[rows]
 
 # === ENRICH FILTERED DATA ===
-filtered["ActualSpread"] = filtered["HomeScore"] - filtered["AwayScore"]
-filtered["SpreadCovered"] = filtered.apply(
-    lambda row: (
-        "Home Covered" if row["Favorite"] == "Home" and row["ActualSpread"] > row["OpeningPointSpread"]
-        else "Away Covered" if row["Favorite"] == "Away" and -row["ActualSpread"] > row["OpeningPointSpread"]
-        else "Home Missed" if row["Favorite"] == "Home"
-        else "Away Missed"
-    ), axis=1
-)
-filtered["OU_Result"] = filtered.apply(
-    lambda row: "Over" if row["OverHit"] else "Under" if row["UnderHit"] else "Push",
-    axis=1
-)
+filtered = filtered.assign(**result_labels(filtered))
 
 # === GAME DETAILS TABLE ===
 section_title("📋 Game Details Table")
@@ -94,15 +95,13 @@ renamed = filtered[[
 default_cols = ["Home", "Away", "H", "A", "Win", "Fav", "ML ✓", "Spread", "O/U", "Final Total", "Covered?"]
 columns_to_show = st.multiselect("Choose columns to display:", options=renamed.columns.tolist(), default=default_cols)
 
-format_dict = {"Spread": "{:.2f}", "O/U": "{:.2f}"}
-styled_main = renamed[columns_to_show].style \
-    .format(format_dict) \
-    .set_properties(**{'text-align': 'center'}) \
-    .set_table_styles([
-        {'selector': 'th', 'props': [('text-align', 'center')]},
-        {'selector': 'td', 'props': [('text-align', 'center')]}
-    ])
-st.table(styled_main)
+main_table = renamed[columns_to_show]
+column_config = centered_columns(main_table, {
+    "Spread": st.column_config.NumberColumn(format="%.2f", alignment="center"),
+    "O/U": st.column_config.NumberColumn(format="%.2f", alignment="center"),
+    "ML ✓": st.column_config.CheckboxColumn(alignment="center")
+})
+st.dataframe(main_table, column_config=column_config, width="stretch")
 
 # === SUMMARY METRICS ===
 section_title("📊 Summary Stats")
@@ -110,7 +109,7 @@ total = len(filtered)
 correct_ml = filtered["CorrectSide"].sum()
 over_hits = filtered["OverHit"].sum()
 under_hits = filtered["UnderHit"].sum()
-spread_covered = (filtered["SpreadCovered"].str.contains("Covered")).sum()
+spread_covered = int(filtered["Covered"].sum())
 
 col1, col2, col3 = st.columns(3)
 col1.metric("Games", total)
@@ -121,74 +120,52 @@ col4, col5 = st.columns(2)
 col4.metric("Over Hit", over_hits)
 col5.metric("Under Hit", under_hits)
 
+# === PER-GAME CHART BASE ===
+# One row per matchup/result pair with a game count, so the browser draws summary bars, not one mark per game
+keys, labels = matchup_keys(filtered)
+matchup_key = pd.Series(keys, index=filtered.index, name="MatchupKey")
+game_counts = filtered.groupby(
+    [matchup_key, "OU_Result", "SpreadCovered"], sort=False
+).size().reset_index(name="Games")
+game_counts["Matchup"] = labels[game_counts["MatchupKey"].to_numpy()]
+game_chart = alt.Chart(game_counts[["Matchup", "OU_Result", "SpreadCovered", "Games"]]).mark_bar().encode(
+    x=alt.X("Matchup:N", sort=None)
+).properties(height=400)
+
 # === OVER/UNDER BY GAME ===
 section_title("🎯 Over/Under by Game")
-ou_df = filtered.copy()
-ou_df["Matchup"] = ou_df["AwayTeam"] + " @ " + ou_df["HomeTeam"]
-ou_df["Indicator"] = 1
-ou_chart = alt.Chart(ou_df).mark_bar().encode(
-    x=alt.X("Matchup:N", sort=None),
-    y=alt.Y("Indicator:Q", title="Outcome"),
+ou_chart = game_chart.encode(
+    y=alt.Y("Games:Q", title="Outcome"),
     color=alt.Color("OU_Result:N", scale=alt.Scale(domain=["Over", "Under", "Push"], range=["red", "blue", "gray"])),
-    tooltip=["Matchup", "OU_Result"]
-).properties(height=400)
-st.altair_chart(ou_chart, use_container_width=True)
+    tooltip=["Matchup:N", "OU_Result:N", "Games:Q"]
+)
+st.altair_chart(ou_chart, width="stretch")
 
 # === SPREAD COVERAGE BY GAME ===
 section_title("🟢 Spread Coverage by Game")
-spread_df = filtered.copy()
-spread_df["Matchup"] = spread_df["AwayTeam"] + " @ " + spread_df["HomeTeam"]
-spread_df["Result"] = spread_df["SpreadCovered"]
-spread_df["CoveredNumeric"] = 1
-spread_chart = alt.Chart(spread_df).mark_bar().encode(
-    x=alt.X("Matchup:N", sort=None),
-    y=alt.Y("CoveredNumeric:Q", title="Game Present (Color = Result)"),
-    color=alt.Color("Result:N", scale=alt.Scale(
+spread_chart = game_chart.encode(
+    y=alt.Y("Games:Q", title="Game Present (Color = Result)"),
+    color=alt.Color("SpreadCovered:N", title="Result", scale=alt.Scale(
         domain=["Home Covered", "Away Covered", "Home Missed", "Away Missed"],
         range=["green", "green", "red", "red"]
     )),
-    tooltip=["Matchup", "Result"]
-).properties(height=400)
-st.altair_chart(spread_chart, use_container_width=True)
+    tooltip=["Matchup:N", alt.Tooltip("SpreadCovered:N", title="Result"), "Games:Q"]
+)
+st.altair_chart(spread_chart, width="stretch")
 
 # === AGGREGATES ===
 section_title("📅 Weekly + Overall Analysis")
-all_df = df.copy()
-all_df["Week"] = all_df["GameDate"].dt.to_period("W").astype(str)
-all_df["CorrectSide"] = all_df["CorrectSide"].astype(int)
-all_df["ActualSpread"] = all_df["HomeScore"] - all_df["AwayScore"]
-
-# Spread and total result labels
-all_df["SpreadCovered"] = all_df.apply(
-    lambda row: (
-        "Home Covered" if row["Favorite"] == "Home" and row["ActualSpread"] > row["OpeningPointSpread"]
-        else "Away Covered" if row["Favorite"] == "Away" and -row["ActualSpread"] > row["OpeningPointSpread"]
-        else "Home Missed" if row["Favorite"] == "Home"
-        else "Away Missed"
-    ), axis=1
-)
-all_df["TotalResult"] = all_df.apply(
-    lambda row: (
-        "Over Home" if row["OverHit"] and row["Favorite"] == "Home"
-        else "Over Away" if row["OverHit"] and row["Favorite"] == "Away"
-        else "Under Home" if row["UnderHit"] and row["Favorite"] == "Home"
-        else "Under Away"
-    ), axis=1
+weekly_display = weekly_raw.assign(ML_Accuracy=weekly_raw["ML_Accuracy"] * 100)
+weekly_display.index = weekly_display.index.astype(str)
+st.dataframe(
+    weekly_display,
+    column_order=["ML_Accuracy", "Games", "OverHit", "UnderHit"],
+    column_config=centered_columns(weekly_display, {
+        "ML_Accuracy": st.column_config.NumberColumn("Moneyline Accuracy", format="%.0f%%", alignment="center")
+    }),
+    width="stretch"
 )
 
-# Weekly summary
-weekly_raw = all_df.groupby("Week").agg({
-    "CorrectSide": "mean",
-    "GameDate": "count",
-    "OverHit": "sum",
-    "UnderHit": "sum"
-}).rename(columns={"CorrectSide": "ML_Accuracy", "GameDate": "Games"})
-
-weekly_display = weekly_raw.copy()
-weekly_display["Moneyline Accuracy"] = (weekly_display["ML_Accuracy"] * 100).round().astype(int).astype(str) + "%"
-weekly_display = weekly_display[["Moneyline Accuracy", "Games", "OverHit", "UnderHit"]]
-st.table(styled_table(weekly_display))
-
 # === OVERALL TOTALS ===
 section_title("🧮 Overall Totals Across All Weeks")
 total_games_all = weekly_raw["Games"].sum()
@@ -200,29 +177,33 @@ under_pct = total_unders / total_games_all
 
 totals_df = pd.DataFrame({
     "Games": [total_games_all],
-    "ML Accuracy": [f"{correct_pct_all:.0%}"],
+    "ML Accuracy": [correct_pct_all * 100],
     "Over Hit": [f"{total_overs} ({over_pct:.0%})"],
     "Under Hit": [f"{total_unders} ({under_pct:.0%})"]
 }, index=["Total"])
-st.table(styled_table(totals_df))
+st.dataframe(
+    totals_df,
+    column_config=centered_columns(totals_df, {
+        "ML Accuracy": st.column_config.NumberColumn(format="%.0f%%", alignment="center")
+    }),
+    width="stretch"
+)
 
 # === SPREAD SUMMARY ===
 section_title("📐 Spread Coverage Summary")
-spread_counts = all_df["SpreadCovered"].value_counts()
 spread_total = spread_counts.sum()
 spread_summary = spread_counts.reset_index()
 spread_summary.columns = ["Outcome", "Games"]
-spread_summary["%"] = (spread_summary["Games"] / spread_total).apply(lambda x: f"{x:.0%}")
-st.table(styled_table(spread_summary))
+spread_summary["%"] = spread_summary["Games"] / spread_total
+st.table(styled_table(spread_summary).format({"%": "{:.0%}"}))
 
 # === TOTAL RESULT SUMMARY ===
 section_title("🌡️ Total Results by Favorite")
-total_counts = all_df["TotalResult"].value_counts()
 total_total = total_counts.sum()
 total_summary = total_counts.reset_index()
 total_summary.columns = ["Outcome", "Games"]
-total_summary["%"] = (total_summary["Games"] / total_total).apply(lambda x: f"{x:.0%}")
-st.table(styled_table(total_summary))
+total_summary["%"] = total_summary["Games"] / total_total
+st.table(styled_table(total_summary).format({"%": "{:.0%}"}))
 
 # === FOOTER ===
 st.markdown("---")
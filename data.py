@@ -0,0 +1,138 @@
+import os
+import tempfile
+import streamlit as st
+import pandas as pd
+import numpy as np
+
+# === RESULT LABELS ===
+# All labels come from one set of boolean masks, so each column is read once per call
+def result_labels(df):
+    fav_home = (df["Favorite"] == "Home").to_numpy()
+    fav_away = (df["Favorite"] == "Away").to_numpy()
+    over = df["OverHit"].to_numpy(dtype=bool)
+    under = df["UnderHit"].to_numpy(dtype=bool)
+    spread = df["HomeScore"].to_numpy() - df["AwayScore"].to_numpy()
+    line = df["OpeningPointSpread"].to_numpy()
+    covered = np.where(fav_home, spread > line, -spread > line)
+    return {
+        "SpreadCovered": np.select(
+            [fav_home & covered, fav_away & covered, fav_home],
+            ["Home Covered", "Away Covered", "Home Missed"],
+            default="Away Missed"
+        ),
+        "Covered": (fav_home | fav_away) & covered,
+        "OU_Result": np.select([over, under], ["Over", "Under"], default="Push"),
+        "TotalResult": np.select(
+            [over & fav_home, over & fav_away, under & fav_home],
+            ["Over Home", "Over Away", "Under Home"],
+            default="Under Away"
+        )
+    }
+
+# === LOAD DATA ===
+CSV_PATH = "comparison.csv"
+DATA_PATH = "comparison.parquet"
+TEAM_COLS = ["HomeTeam", "AwayTeam"]
+SIDE_COLS = ["Favorite", "Winner"]
+
+# Convert the CSV to typed parquet whenever the CSV (or this conversion) is newer, so loads skip text parsing
+def build_parquet():
+    source_mtime = max(os.path.getmtime(CSV_PATH), os.path.getmtime(__file__))
+    if os.path.exists(DATA_PATH) and os.path.getmtime(DATA_PATH) >= source_mtime:
+        return
+    df = pd.read_csv(CSV_PATH)
+    df["GameDate"] = pd.to_datetime(df["GameDate"])
+    df["GameId"] = df["GameId"].astype(str)
+    df = df.drop_duplicates(subset=["GameId"])
+    # Home and away share one team dtype so their category codes line up
+    teams = pd.CategoricalDtype(sorted(set(df["HomeTeam"]).union(df["AwayTeam"])))
+    df[TEAM_COLS] = df[TEAM_COLS].astype(teams)
+    df[SIDE_COLS] = df[SIDE_COLS].astype("category")
+    # Write beside the target and swap it in, so concurrent sessions never read a half-written file
+    fd, tmp_path = tempfile.mkstemp(suffix=".tmp", dir=os.path.dirname(os.path.abspath(DATA_PATH)))
+    os.close(fd)
+    try:
+        df.to_parquet(tmp_path, engine="pyarrow", index=False)
+        os.replace(tmp_path, DATA_PATH)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+# Cached helpers are keyed on the parquet mtime rather than the frame: a refreshed file is picked up
+# without a restart, and reruns never hash the whole dataset just to find a cached result
+@st.cache_data(show_spinner=False)
+def load_data(mtime):
+    df = pd.read_parquet(DATA_PATH, engine="pyarrow")
+    # Day-resolution key for the date filter, so reruns compare datetimes instead of building date objects
+    df["GameDateDay"] = df["GameDate"].values.astype("datetime64[D]")
+    return df
+
+@st.cache_data(show_spinner=False)
+def game_dates(mtime):
+    df = load_data(mtime)
+    return np.unique(df["GameDateDay"].values).astype("datetime64[D]").tolist()
+
+@st.cache_data(show_spinner=False)
+def team_list(mtime):
+    df = load_data(mtime)
+    return df["HomeTeam"].cat.categories.union(df["AwayTeam"].cat.categories).tolist()
+
+# Each away/home pairing maps to away_code * n_teams + home_code, which indexes this label table
+@st.cache_data(show_spinner=False)
+def matchup_labels(teams):
+    return np.array([f"{away} @ {home}" for away in teams for home in teams])
+
+# Keys and labels both come from the HomeTeam categories, so a key always indexes its own label
+def matchup_keys(df):
+    teams = df["HomeTeam"].cat.categories
+    if not df["AwayTeam"].cat.categories.equals(teams):
+        raise ValueError("HomeTeam and AwayTeam must share the same team categories")
+    away = df["AwayTeam"].cat.codes.to_numpy(np.int32)
+    home = df["HomeTeam"].cat.codes.to_numpy(np.int32)
+    if (away < 0).any() or (home < 0).any():
+        raise ValueError("Every game needs both a home and an away team")
+    return away * len(teams) + home, matchup_labels(teams.tolist())
+
+# Row positions per date and per team, so filtering is a lookup rather than a column scan
+@st.cache_data(show_spinner=False)
+def build_date_index(mtime):
+    df = load_data(mtime)
+    return {day.date(): rows for day, rows in df.groupby("GameDateDay").indices.items()}
+
+@st.cache_data(show_spinner=False)
+def build_team_index(mtime):
+    df = load_data(mtime)
+    home = df.groupby("HomeTeam", observed=True).indices
+    away = df.groupby("AwayTeam", observed=True).indices
+    empty = np.array([], dtype=np.intp)
+    return {team: np.union1d(home.get(team, empty), away.get(team, empty)) for team in set(home) | set(away)}
+
+# === FULL-SEASON ENRICHMENT ===
+@st.cache_data(show_spinner=False)
+def enrich_full(mtime):
+    df = load_data(mtime)
+    # Derived keys and labels stay local, so the full frame is never copied
+    # Period keys group on integer ordinals and sort chronologically, even across years
+    week = df["GameDate"].dt.to_period("W").rename("Week")
+
+    # Weekly summary: one grouped sum plus group sizes
+    weekly = df.groupby(week)[["CorrectSide", "OverHit", "UnderHit"]]
+    sums = weekly.sum()
+    games = weekly.size()
+    weekly_raw = pd.DataFrame({
+        "ML_Accuracy": sums["CorrectSide"] / games,
+        "Games": games,
+        "OverHit": sums["OverHit"],
+        "UnderHit": sums["UnderHit"]
+    })
+
+    # Spread and total result labels
+    labels = result_labels(df)
+    spread_counts = pd.Series(labels["SpreadCovered"], name="SpreadCovered").value_counts()
+    total_counts = pd.Series(labels["TotalResult"], name="TotalResult").value_counts()
+    return weekly_raw, spread_counts, total_counts
+
+# === ENTRY POINT ===
+def data_version():
+    build_parquet()
+    return os.path.getmtime(DATA_PATH)